@@ -7,7 +7,8 @@ for extracurricular activities at Mergington High School.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
+import orjson
 import os
 from pathlib import Path
 
@@ -86,7 +87,9 @@ def root():
 
 @app.get("/activities")
 def get_activities():
-    return activities
+    # The activities are already JSON-native, so serialize them directly
+    # instead of going through FastAPI's jsonable_encoder
+    return Response(content=orjson.dumps(activities), media_type="application/json")
 
 
 @app.post("/activities/{activity_name}/signup")
@@ -0,0 +1,53 @@
+"""
+Shared pytest configuration for the Mergington High School API tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the src directory to the path so we can import the app
+_SRC_DIR = str(Path(__file__).resolve().parents[1] / "src")
+sys.path.insert(0, _SRC_DIR)
+
+from app import app as _app, activities as _activities
+
+# Snapshots of the activities, taken at import before any test can mutate the app
+_FROZEN_SCHEMA = tuple(
+    (name, details["description"], details["schedule"], details["max_participants"])
+    for name, details in _activities.items()
+)
+_PARTICIPANTS_SNAPSHOT = {
+    name: tuple(details["participants"]) for name, details in _activities.items()
+}
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Fixture to provide the FastAPI app under test"""
+    return _app
+
+
+@pytest.fixture(scope="session")
+def activities():
+    """Fixture to provide the in-memory activity database of the app"""
+    return _activities
+
+
+@pytest.fixture(scope="session")
+def frozen_schema():
+    """Fixture to provide the (name, description, schedule, max_participants) of every activity"""
+    return _FROZEN_SCHEMA
+
+
+@pytest.fixture(scope="session")
+def participants_snapshot():
+    """Fixture to provide the original participants of every activity"""
+    return _PARTICIPANTS_SNAPSHOT
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests marked ``per_activity`` over every activity name"""
+    if metafunc.definition.get_closest_marker("per_activity"):
+        metafunc.parametrize("activity_name", [name for name, *_ in _FROZEN_SCHEMA])
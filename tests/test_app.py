@@ -4,39 +4,49 @@ Tests for the Mergington High School API
 Tests cover the main endpoints for viewing activities and signing up for them.
 """
 
+import asyncio
+
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
 
-# Add the src directory to the path so we can import the app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+_ACTIVITIES_URL = "/activities"
+_BASKETBALL_SIGNUP = f"{_ACTIVITIES_URL}/Basketball/signup"
+_SOCCER_SIGNUP = f"{_ACTIVITIES_URL}/Soccer/signup"
+_MISSING_SIGNUP = f"{_ACTIVITIES_URL}/NonexistentActivity/signup"
 
-from app import app, activities
 
+def _json(response):
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
 
-@pytest.fixture
-def client():
-    """Fixture to provide a test client for the FastAPI app"""
+
+@pytest.fixture(scope="module")
+def client(app):
+    """Fixture to provide a test client for the FastAPI app, shared across the module"""
     return TestClient(app)
 
 
 @pytest.fixture
-def reset_activities():
+def reset_activities(activities, participants_snapshot):
     """Fixture to reset activities to their original state after each test"""
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
-        for name, details in activities.items()
-    }
     yield
-    # Reset after test
-    for name, details in activities.items():
-        activities[name]["participants"] = original_activities[name]["participants"].copy()
+    # Restore participants in place after test
+    for name, snapshot in participants_snapshot.items():
+        activities[name]["participants"][:] = snapshot
+
+
+@pytest.fixture(scope="module")
+def activities_response(client):
+    """Fixture to fetch the /activities response once per module for read-only tests"""
+    return client.get(_ACTIVITIES_URL)
+
+
+@pytest.fixture(scope="module")
+def activities_payload(activities_response):
+    """Fixture to decode the shared /activities response once per module"""
+    return _json(activities_response)
 
 
 class TestRoot:
@@ -52,19 +62,17 @@ class TestRoot:
 class TestGetActivities:
     """Tests for the GET /activities endpoint"""
 
-    def test_get_all_activities(self, client):
+    def test_get_all_activities(self, activities_response):
         """Test that all activities are returned"""
-        response = client.get("/activities")
-        assert response.status_code == 200
+        assert activities_response.status_code == 200
 
-        data = response.json()
+        data = _json(activities_response)
         assert isinstance(data, dict)
         assert len(data) > 0
 
-    def test_get_activities_contains_basketball(self, client):
+    def test_get_activities_contains_basketball(self, activities_response):
         """Test that Basketball activity is in the response"""
-        response = client.get("/activities")
-        data = response.json()
+        data = _json(activities_response)
 
         assert "Basketball" in data
         assert "description" in data["Basketball"]
@@ -72,29 +80,28 @@ class TestGetActivities:
         assert "max_participants" in data["Basketball"]
         assert "participants" in data["Basketball"]
 
-    def test_get_activities_structure(self, client):
+    def test_get_activities_structure(self, activities_response, frozen_schema):
         """Test that each activity has the correct structure"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_details in data.items():
-            assert isinstance(activity_name, str)
-            assert isinstance(activity_details, dict)
-            assert "description" in activity_details
-            assert "schedule" in activity_details
-            assert "max_participants" in activity_details
+        data = _json(activities_response)
+
+        assert len(data) == len(frozen_schema)
+        for activity_name, description, schedule, max_participants in frozen_schema:
+            activity_details = data[activity_name]
+            assert activity_details["description"] == description
+            assert activity_details["schedule"] == schedule
             assert isinstance(activity_details["max_participants"], int)
-            assert "participants" in activity_details
+            assert activity_details["max_participants"] == max_participants
             assert isinstance(activity_details["participants"], list)
 
-    def test_get_activities_initial_participants(self, client):
+    def test_get_activities_initial_participants(self, activities_response):
         """Test that initial participants are loaded correctly"""
-        response = client.get("/activities")
-        data = response.json()
+        data = _json(activities_response)
 
         # Basketball should have initial participants
-        assert len(data["Basketball"]["participants"]) > 0
-        assert "liam@mergington.edu" in data["Basketball"]["participants"]
+        participants = set(data["Basketball"]["participants"])
+        assert len(participants) > 0
+        assert len(participants) == len(data["Basketball"]["participants"])
+        assert "liam@mergington.edu" in participants
 
 
 class TestSignup:
@@ -102,84 +109,91 @@ class TestSignup:
 
     def test_signup_success(self, client, reset_activities):
         """Test successful signup for an activity"""
+        email = "newstudent@mergington.edu"
+
         response = client.post(
-            "/activities/Basketball/signup",
-            params={"email": "newstudent@mergington.edu"}
+            _BASKETBALL_SIGNUP,
+            params={"email": email}
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
+        assert email in data["message"]
         assert "Basketball" in data["message"]
 
     def test_signup_adds_participant(self, client, reset_activities):
         """Test that signup actually adds the participant"""
         email = "newstudent@mergington.edu"
-        client.post(
-            "/activities/Basketball/signup",
+        response = client.post(
+            _BASKETBALL_SIGNUP,
             params={"email": email}
         )
+        assert response.status_code == 200
 
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Basketball"]["participants"]
+        response = client.get(_ACTIVITIES_URL)
+        data = _json(response)
+        participants = set(data["Basketball"]["participants"])
+        assert len(participants) == len(data["Basketball"]["participants"])
+        assert email in participants
 
     def test_signup_duplicate_student(self, client, reset_activities):
         """Test that duplicate signups are rejected"""
         email = "liam@mergington.edu"  # Already signed up for Basketball
 
         response = client.post(
-            "/activities/Basketball/signup",
+            _BASKETBALL_SIGNUP,
             params={"email": email}
         )
 
         assert response.status_code == 400
-        data = response.json()
+        data = _json(response)
         assert "already signed up" in data["detail"].lower()
 
     def test_signup_nonexistent_activity(self, client):
         """Test signup for a nonexistent activity"""
         response = client.post(
-            "/activities/NonexistentActivity/signup",
+            _MISSING_SIGNUP,
             params={"email": "student@mergington.edu"}
         )
 
         assert response.status_code == 404
-        data = response.json()
+        data = _json(response)
         assert "not found" in data["detail"].lower()
 
-    def test_signup_multiple_activities(self, client, reset_activities):
+    @pytest.mark.asyncio
+    async def test_signup_multiple_activities(self, app, reset_activities):
         """Test that a student can sign up for multiple activities"""
         email = "versatile@mergington.edu"
 
-        # Sign up for Basketball
-        response1 = client.post(
-            "/activities/Basketball/signup",
-            params={"email": email}
-        )
-        assert response1.status_code == 200
-
-        # Sign up for Soccer
-        response2 = client.post(
-            "/activities/Soccer/signup",
-            params={"email": email}
-        )
-        assert response2.status_code == 200
-
-        # Verify signup for both
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Basketball"]["participants"]
-        assert email in data["Soccer"]["participants"]
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test"
+        ) as async_client:
+            # Sign up for Basketball and Soccer concurrently
+            response1, response2 = await asyncio.gather(
+                async_client.post(_BASKETBALL_SIGNUP, params={"email": email}),
+                async_client.post(_SOCCER_SIGNUP, params={"email": email}),
+            )
+            assert response1.status_code == 200
+            assert response2.status_code == 200
+
+            # Verify signup for both
+            response = await async_client.get(_ACTIVITIES_URL)
+
+        data = _json(response)
+        for activity_name in ("Basketball", "Soccer"):
+            participants = set(data[activity_name]["participants"])
+            assert len(participants) == len(data[activity_name]["participants"])
+            assert email in participants
 
     def test_signup_email_validation(self, client, reset_activities):
         """Test signup with various email formats"""
         email = "test.student@mergington.edu"
 
         response = client.post(
-            "/activities/Basketball/signup",
+            _BASKETBALL_SIGNUP,
             params={"email": email}
         )
 
@@ -189,38 +203,14 @@ class TestSignup:
 class TestActivityData:
     """Tests for activity data integrity"""
 
-    def test_activities_have_descriptions(self, client):
-        """Test that all activities have descriptions"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_details in data.items():
-            assert activity_details["description"], f"{activity_name} has no description"
-            assert len(activity_details["description"]) > 0
-
-    def test_activities_have_schedules(self, client):
-        """Test that all activities have schedules"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_details in data.items():
-            assert activity_details["schedule"], f"{activity_name} has no schedule"
-            assert len(activity_details["schedule"]) > 0
-
-    def test_max_participants_positive(self, client):
-        """Test that max_participants is a positive number"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_details in data.items():
-            assert activity_details["max_participants"] > 0, \
-                f"{activity_name} has invalid max_participants"
-
-    def test_participants_count_valid(self, client):
-        """Test that participants count doesn't exceed max"""
-        response = client.get("/activities")
-        data = response.json()
-
-        for activity_name, activity_details in data.items():
-            assert len(activity_details["participants"]) <= activity_details["max_participants"], \
-                f"{activity_name} exceeds max participants"
+    @pytest.mark.per_activity
+    def test_activity_invariants(self, activity_name, activities_payload):
+        """Test that an activity has a description, a schedule and a valid capacity"""
+        activity_details = activities_payload[activity_name]
+
+        assert activity_details["description"], f"{activity_name} has no description"
+        assert activity_details["schedule"], f"{activity_name} has no schedule"
+        assert activity_details["max_participants"] > 0, \
+            f"{activity_name} has invalid max_participants"
+        assert len(activity_details["participants"]) <= activity_details["max_participants"], \
+            f"{activity_name} exceeds max participants"